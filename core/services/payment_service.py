@@ -347,6 +347,8 @@ class PaymentService:
         """
         import random
         from selenium.webdriver.common.by import By
+        # Задержки между символами берем из общего пула, а не random.uniform на каждый символ
+        from utils.performance import typing_jitter
         
         async def human_type_text(element, text, min_delay=0.05, max_delay=0.2):
             """Человечный ввод текста по одному символу с случайными задержками"""
@@ -358,7 +360,7 @@ class PaymentService:
                 
                 for char in text:
                     element.send_keys(char)
-                    delay = random.uniform(min_delay, max_delay)
+                    delay = typing_jitter.next(min_delay, max_delay)
                     await asyncio.sleep(delay)
                 
                 await asyncio.sleep(random.uniform(0.2, 0.5))
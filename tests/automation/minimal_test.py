@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 import asyncio
 import logging
+import os
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Постоянный профиль: повторные запуски переиспользуют дисковые кэши Chrome.
+# В CI параллельные воркеры получают отдельный каталог на процесс.
+if os.getenv('CI'):
+    PROFILE_DIR = Path(f"/tmp/chrome-testprofile-{os.getpid()}")
+else:
+    PROFILE_DIR = Path("/tmp/chrome-testprofile")
+
 async def test_minimal_chrome():
     """Минимальный тест Chrome"""
     try:
@@ -18,6 +27,14 @@ async def test_minimal_chrome():
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         
+        # Теплый профиль вместо холодного старта
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        options.add_argument(f"--user-data-dir={PROFILE_DIR}")
+        options.add_argument("--profile-directory=Default")
+        options.add_argument(f"--disk-cache-dir={PROFILE_DIR / 'cache'}")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        
         # Создаем драйвер
         driver = webdriver.Chrome(options=options)
         
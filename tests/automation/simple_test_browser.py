@@ -95,29 +95,24 @@ async def test_multitransfer_site():
             if success:
                 logger.info("✅ Successfully reached multitransfer.ru")
                 
-                # Ждем загрузки
-                await asyncio.sleep(5)
+                # Ждем загрузки (по событию, а не фиксированной паузой)
+                await browser_manager.wait_for_page_ready(timeout=10)
                 
                 # Ищем основные элементы
                 logger.info("�� Searching for form elements...")
                 
-                # Поиск полей ввода
-                amount_elements = await browser_manager.find_elements_safe(
-                    By.XPATH, 
-                    "//input[@type='text' or @type='number']"
-                )
-                logger.info(f"💰 Found {len(amount_elements)} input fields")
-                
-                # Поиск всех кнопок
-                buttons = await browser_manager.find_elements_safe(
-                    By.XPATH, 
-                    "//button"
-                )
-                logger.info(f"🔘 Found {len(buttons)} buttons")
+                # Поля ввода и кнопки одним запросом к браузеру
+                counts = await browser_manager.execute_script(
+                    "return [document.querySelectorAll('input[type=text], input[type=number]').length,"
+                    " document.querySelectorAll('button').length];"
+                ) or [0, 0]
+                input_count, button_count = counts
+                logger.info(f"💰 Found {input_count} input fields")
+                logger.info(f"🔘 Found {button_count} buttons")
                 
                 # Делаем скриншот
-                await browser_manager.take_screenshot("multitransfer_page.png")
-                logger.info("📸 Screenshot saved as multitransfer_page.png")
+                await browser_manager.take_screenshot("multitransfer_page.jpg")
+                logger.info("📸 Screenshot saved as multitransfer_page.jpg")
                 
                 return True
             else:
@@ -128,6 +123,54 @@ async def test_multitransfer_site():
         logger.error(f"❌ MultiTransfer site test failed: {e}")
         return False
 
+# Элементы с булевыми атрибутами: свойство и атрибут расходятся после клика по чекбоксу
+BULK_PROBE_HTML = (
+    '<button id="enabled">ok</button>'
+    '<button id="disabled" disabled>no</button>'
+    '<input id="unchecked" type="checkbox">'
+    '<input id="checked" type="checkbox" checked>'
+    '<input id="readonly" type="text" value="1000" readonly required>'
+)
+BULK_PROBE_ATTRIBUTES = ['disabled', 'checked', 'readonly', 'required', 'value', 'id']
+
+async def test_bulk_attributes():
+    """Тест: get_elements_attributes_bulk совпадает с get_element_attribute"""
+    logger.info("🧪 Testing bulk attribute reader...")
+    
+    try:
+        config = get_test_config()
+        browser_manager = BrowserManager(config, proxy_manager=None)
+        
+        async with browser_manager:
+            success = await browser_manager.start_browser(use_proxy=False)
+            if not success:
+                return False
+            
+            await browser_manager.execute_script("document.body.innerHTML = arguments[0];", BULK_PROBE_HTML)
+            # Снимаем галочку кликом: атрибут checked остается, свойство становится false
+            await browser_manager.execute_script("document.getElementById('checked').click();")
+            
+            elements = await browser_manager.find_elements_safe(By.CSS_SELECTOR, "body > *")
+            bulk = await browser_manager.get_elements_attributes_bulk(elements, BULK_PROBE_ATTRIBUTES)
+            
+            mismatches = 0
+            for element, bulk_values in zip(elements, bulk):
+                for attribute in BULK_PROBE_ATTRIBUTES:
+                    single = await browser_manager.get_element_attribute(element, attribute)
+                    if single != bulk_values[attribute]:
+                        mismatches += 1
+                        logger.error(f"❌ {bulk_values['id']}.{attribute}: single={single!r} bulk={bulk_values[attribute]!r}")
+            
+            if len(bulk) == len(elements) == 5 and not mismatches:
+                logger.info("✅ Bulk attributes match get_element_attribute")
+                return True
+            logger.error(f"❌ Bulk attribute check failed ({mismatches} mismatches)")
+            return False
+            
+    except Exception as e:
+        logger.error(f"❌ Bulk attribute test failed: {e}")
+        return False
+
 async def main():
     """Главная функция тестирования"""
     logger.info("🚀 Starting simplified browser tests...")
@@ -140,7 +183,11 @@ async def main():
     test2_result = await test_multitransfer_site()
     logger.info(f"📊 MultiTransfer site test: {'✅ PASSED' if test2_result else '❌ FAILED'}")
     
-    if test1_result and test2_result:
+    # Тест 3: Пакетное чтение атрибутов
+    test3_result = await test_bulk_attributes()
+    logger.info(f"📊 Bulk attribute test: {'✅ PASSED' if test3_result else '❌ FAILED'}")
+    
+    if test1_result and test2_result and test3_result:
         logger.info("🎉 ALL TESTS PASSED - Ready for automation!")
         logger.info("📋 Next steps:")
         logger.info("   1. Browser works correctly")
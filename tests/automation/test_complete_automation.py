@@ -8,6 +8,7 @@ import asyncio
 import logging
 import random
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
@@ -15,12 +16,46 @@ sys.path.insert(0, str(Path(__file__).parent))
 from web.browser.manager import BrowserManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import (
+    TimeoutException,
+    StaleElementReferenceException,
+    NoSuchElementException,
+    ElementNotInteractableException,
+    ElementClickInterceptedException,
+    JavascriptException,
+)
 from core.proxy.manager import ProxyManager
 from core.config import Config
+from utils.performance import get_optimized_selector, VSE_KARTY_XPATH
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Якоря шагов: ждем появления следующего элемента вместо фиксированных пауз.
+# Ожидание идет по тому же предикату, которым шаг потом ищет свой элемент
+# Кнопка шага 1: регистронезависимо и по всему тексту кнопки, а не только прямым текстовым узлам
+TRANSFER_ABROAD_XPATH = (
+    "//button[contains(translate(normalize-space(.), "
+    "'абвгдежзийклмнопрстуфхцчшщъыьэюя', 'АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'), "
+    "'ПЕРЕВЕСТИ ЗА РУБЕЖ')]"
+)
+TAJIKISTAN_XPATH = get_optimized_selector('tajikistan_select')
+AMOUNT_XPATH = get_optimized_selector('amount_input')
+TJS_XPATH = get_optimized_selector('currency_tjs')
+TRANSFER_METHOD_XPATH = get_optimized_selector('transfer_method_dropdown')
+CONTINUE_TEXT = "ПРОДОЛЖИТЬ"
+
+SITE_URL = "https://multitransfer.ru"
+
+# Ожидаемые ошибки при работе с кандидатом - переходим к следующему элементу
+ELEMENT_ERRORS = (
+    StaleElementReferenceException,
+    NoSuchElementException,
+    ElementNotInteractableException,
+    ElementClickInterceptedException,
+    JavascriptException,
+)
+
 def get_test_config():
     return {
         'browser': {
@@ -35,26 +70,129 @@ def get_test_config():
     }
 
 async def human_type_text(browser_manager, element, text, min_delay=0.05, max_delay=0.2):
-    """Человечный ввод текста по одному символу с случайными задержками"""
+    """Ввод текста одной CDP-командой; случайность сохраняется только в паузах"""
     try:
         element.clear()
         await asyncio.sleep(random.uniform(0.1, 0.3))
         
-        logger.info(f"🖊️ Typing '{text}' character by character...")
+        logger.info("🖊️ Typing '%s'...", text)
         
-        for char in text:
-            element.send_keys(char)
-            delay = random.uniform(min_delay, max_delay)
-            await asyncio.sleep(delay)
+        # Фокус + Input.insertText: один round-trip вместо send_keys на каждый символ
+        driver = browser_manager.driver
+        driver.execute_script("arguments[0].focus();", element)
+        await asyncio.sleep(random.uniform(min_delay, max_delay))
+        driver.execute_cdp_cmd("Input.insertText", {"text": text})
         
         await asyncio.sleep(random.uniform(0.2, 0.5))
-        logger.info(f"✅ Finished typing '{text}'")
+        logger.info("✅ Finished typing '%s'", text)
         return True
         
     except Exception as e:
-        logger.error(f"❌ Failed to type '{text}': {e}")
+        logger.error("❌ Failed to type '%s': %s", text, e)
+        return False
+
+# Индексы видимых элементов одним execute_script вместо is_displayed() на каждый
+VISIBLE_INDICES_JS = """
+return arguments[0].map((e, i) => [e, i])
+    .filter(([e]) => e.getClientRects().length > 0
+        && getComputedStyle(e).visibility !== 'hidden')
+    .map(([, i]) => i);
+"""
+
+async def visible_elements(browser_manager, elements):
+    """Оставить только видимые элементы (один round-trip на весь список)"""
+    if not elements:
+        return []
+    indices = await browser_manager.execute_script(VISIBLE_INDICES_JS, elements) or []
+    return [elements[i] for i in indices]
+
+# Кнопка по видимому тексту (innerText учитывает text-transform), без учета регистра
+BUTTON_BY_TEXT_JS_FN = (
+    "(needle) => Array.from(document.querySelectorAll('button'))"
+    "  .find(b => (b.innerText || '').toUpperCase().includes(needle)) || null"
+)
+
+async def find_button_by_text(browser_manager, needle):
+    """Найти кнопку по тексту одним execute_script вместо чтения .text каждой кнопки"""
+    return await browser_manager.execute_script(
+        f"return ({BUTTON_BY_TEXT_JS_FN})(arguments[0]);",
+        needle.upper()
+    )
+
+# Ожидание якоря следующего шага: MutationObserver вызывает callback,
+# как только found() находит элемент (без опроса WebDriverWait)
+OBSERVE_UNTIL_FOUND_JS = """
+if (found()) { done(true); return; }
+const timer = setTimeout(() => { observer.disconnect(); done(false); }, timeoutMs);
+const observer = new MutationObserver(() => {
+    if (found()) { observer.disconnect(); clearTimeout(timer); done(true); }
+});
+observer.observe(document.body, {subtree: true, childList: true, attributes: true});
+"""
+
+WAIT_FOR_XPATH_JS = """
+const [xpath, timeoutMs, done] = arguments;
+const found = () => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+""" + OBSERVE_UNTIL_FOUND_JS
+
+# Якорь - кнопка с текстом: тот же предикат, что и в find_button_by_text
+WAIT_FOR_BUTTON_TEXT_JS = f"""
+const [needle, timeoutMs, done] = arguments;
+const found = () => ({BUTTON_BY_TEXT_JS_FN})(needle);
+""" + OBSERVE_UNTIL_FOUND_JS
+
+async def _observe(browser_manager, script, query, timeout):
+    """Запустить ожидание на MutationObserver (False по таймауту)"""
+    driver = browser_manager.driver
+    driver.set_script_timeout(timeout + 1)
+    try:
+        return bool(await asyncio.to_thread(driver.execute_async_script, script, query, timeout * 1000))
+    except TimeoutException:
         return False
 
+async def wait_for_xpath(browser_manager, xpath, timeout=10):
+    """Дождаться появления XPath в DOM (True если появился)"""
+    return await _observe(browser_manager, WAIT_FOR_XPATH_JS, xpath, timeout)
+
+async def wait_for_button_text(browser_manager, needle, timeout=10):
+    """Дождаться кнопки с текстом needle (True если появилась)"""
+    return await _observe(browser_manager, WAIT_FOR_BUTTON_TEXT_JS, needle.upper(), timeout)
+
+async def first_visible_enabled(browser_manager, xpath, timeout=10, poll=0.5):
+    """Первый видимый и активный элемент среди всех совпадений XPath (None по таймауту)"""
+    deadline = time.monotonic() + timeout
+    if not await wait_for_xpath(browser_manager, xpath, timeout):
+        return None
+    while True:
+        candidates = await visible_elements(
+            browser_manager, await browser_manager.find_elements_safe(By.XPATH, xpath)
+        )
+        for element in candidates:
+            try:
+                if element.is_enabled():
+                    return element
+            except ELEMENT_ERRORS:
+                pass
+        if time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(poll)
+
+async def click_and_wait_for(browser_manager, element, next_xpath, timeout=10):
+    """Нативный клик (JS-клик только если он не удался) и ожидание якоря следующего шага.
+    
+    Ошибки JS-клика пробрасываются; возвращает True, если якорь появился.
+    """
+    if not await browser_manager.click_element_safe(element):
+        browser_manager.driver.execute_script("arguments[0].click();", element)
+        logger.info("↪️ Clicked via JavaScript fallback")
+    
+    appeared = await wait_for_xpath(browser_manager, next_xpath, timeout)
+    if not appeared:
+        logger.warning("⚠️ Next step anchor did not appear within %ss: %s", timeout, next_xpath)
+    return appeared
+
 async def test_complete_flow():
     """Полный тест автоматизации"""
     logger.info("🔍 Testing COMPLETE automation flow...")
@@ -67,57 +205,55 @@ async def test_complete_flow():
     proxy_manager = ProxyManager(config_obj.data)
     
     browser_manager = BrowserManager(test_config, proxy_manager=proxy_manager)
+    # Промежуточные скриншоты сохраняются в фоне, не задерживая следующий шаг
+    screenshot_tasks = []
     
     async with browser_manager:
-        # Включаем прокси для тестирования SSH туннеля!
-        success = await browser_manager.start_browser(use_proxy=True)
-        if not success:
-            return False
-        
-        # Переходим на сайт
-        success = await browser_manager.navigate_to_url("https://multitransfer.ru")
-        if not success:
-            return False
-        
-        await asyncio.sleep(random.uniform(3, 5))
-        
-        # Шаг 1: Клик по кнопке "ПЕРЕВЕСТИ ЗА РУБЕЖ"
-        logger.info("📍 Step 1: Click 'ПЕРЕВЕСТИ ЗА РУБЕЖ'")
-        
-        all_buttons = await browser_manager.find_elements_safe(By.TAG_NAME, "button")
-        button_clicked = False
-        
-        for i, btn in enumerate(all_buttons):
-            try:
-                text = await browser_manager.get_element_text(btn)
-                if "ПЕРЕВЕСТИ ЗА РУБЕЖ" in text:
-                    await asyncio.sleep(random.uniform(0.5, 1.0))
-                    if await browser_manager.click_element_safe(btn):
-                        logger.info(f"✅ Successfully clicked button {i}")
-                        button_clicked = True
-                        break
-            except:
-                pass
-        
-        if not button_clicked:
-            logger.error("❌ Could not click 'ПЕРЕВЕСТИ ЗА РУБЕЖ'")
-            return False
-        
-        await asyncio.sleep(random.uniform(3, 5))
-        await browser_manager.take_screenshot("step1_modal_opened.png")
-        
-        # Шаг 2: Выбор Таджикистана
-        logger.info("�� Step 2: Select Tajikistan")
-        
-        tajikistan_clicked = False
-        tajikistan_elements = await browser_manager.find_elements_safe(
-            By.XPATH, 
-            "//span[text()='Таджикистан']/parent::div"
-        )
-        
-        for element in tajikistan_elements:
-            try:
-                if element.is_displayed():
+        try:
+            # Включаем прокси для тестирования SSH туннеля!
+            success = await browser_manager.start_browser(use_proxy=True)
+            if not success:
+                return False
+            
+            # Переходим на сайт
+            success = await browser_manager.navigate_to_url(SITE_URL)
+            if not success:
+                return False
+            
+            await wait_for_xpath(browser_manager, TRANSFER_ABROAD_XPATH)
+            
+            # Шаг 1: Клик по кнопке "ПЕРЕВЕСТИ ЗА РУБЕЖ"
+            logger.info("📍 Step 1: Click 'ПЕРЕВЕСТИ ЗА РУБЕЖ'")
+            
+            # Фильтр по тексту выполняется в XPath - без чтения .text каждой кнопки
+            candidates = await browser_manager.find_elements_safe(By.XPATH, TRANSFER_ABROAD_XPATH)
+            button_clicked = False
+
+            if candidates:
+                await asyncio.sleep(random.uniform(0.5, 1.0))
+                try:
+                    await click_and_wait_for(browser_manager, candidates[0], TAJIKISTAN_XPATH)
+                    button_clicked = True
+                    logger.info("✅ Successfully clicked 'ПЕРЕВЕСТИ ЗА РУБЕЖ'")
+                except ELEMENT_ERRORS as e:
+                    logger.debug("Transfer abroad click failed: %s", e)
+            
+            if not button_clicked:
+                logger.error("❌ Could not click 'ПЕРЕВЕСТИ ЗА РУБЕЖ'")
+                return False
+            
+            screenshot_tasks.append(asyncio.create_task(browser_manager.take_screenshot("step1_modal_opened.jpg")))
+            
+            # Шаг 2: Выбор Таджикистана
+            logger.info("�� Step 2: Select Tajikistan")
+            
+            tajikistan_clicked = False
+            tajikistan_elements = await visible_elements(
+                browser_manager, await browser_manager.find_elements_safe(By.XPATH, TAJIKISTAN_XPATH)
+            )
+            
+            for element in tajikistan_elements:
+                try:
                     await asyncio.sleep(random.uniform(0.3, 0.7))
                     browser_manager.driver.execute_script("arguments[0].scrollIntoView(true);", element)
                     await asyncio.sleep(0.3)
@@ -131,185 +267,151 @@ async def test_complete_flow():
                         logger.info("✅ Successfully clicked Tajikistan via JavaScript")
                         tajikistan_clicked = True
                         break
-            except:
-                pass
-        
-        if not tajikistan_clicked:
-            logger.error("❌ Could not select Tajikistan")
-            return False
-        
-        await asyncio.sleep(random.uniform(3, 5))
-        await browser_manager.take_screenshot("step2_country_selected.png")
-        
-        # Шаг 3: Заполнение суммы
-        logger.info("📍 Step 3: Fill amount")
-        
-        amount_inputs = await browser_manager.find_elements_safe(By.XPATH, "//input[contains(@placeholder, 'RUB')]")
-        
-        amount_filled = False
-        for inp in amount_inputs:
-            try:
-                if inp.is_displayed() and inp.is_enabled():
-                    logger.info("🎯 Filling amount field")
-                    success = await human_type_text(browser_manager, inp, "1000", 0.1, 0.3)
-                    if success:
-                        logger.info("✅ Amount filled successfully")
-                        amount_filled = True
-                        break
-            except:
-                pass
-        
-        if not amount_filled:
-            logger.error("❌ Could not fill amount")
-            return False
-        
-        await asyncio.sleep(3)
-        await browser_manager.take_screenshot("step3_amount_filled.png")
-        
-        # Шаг 4: Выбор валюты TJS
-        logger.info("📍 Step 4: Select TJS currency")
-        
-        # ОПТИМИЗИРОВАНО: Используем только рабочий селектор для TJS
-        working_selector = "//*[text()='TJS']"
-        elements = await browser_manager.find_elements_safe(By.XPATH, working_selector)
-        logger.info(f"🚀 OPTIMIZED: Found {len(elements)} TJS elements with working selector")
-        
-        tjs_selected = False
-        for element in elements:
-            try:
-                if element.is_displayed() and element.is_enabled():
-                    logger.info("🎯 Clicking TJS currency button")
-                    await asyncio.sleep(random.uniform(0.3, 0.7))
-                    
-                    if await browser_manager.click_element_safe(element):
+                except ELEMENT_ERRORS:
+                    pass
+            
+            if not tajikistan_clicked:
+                logger.error("❌ Could not select Tajikistan")
+                return False
+            
+            await browser_manager.wait_for_element(By.XPATH, AMOUNT_XPATH, timeout=10)
+            screenshot_tasks.append(asyncio.create_task(browser_manager.take_screenshot("step2_country_selected.jpg")))
+            
+            # Шаг 3: Заполнение суммы
+            logger.info("📍 Step 3: Fill amount")
+            
+            amount_inputs = await visible_elements(
+                browser_manager, await browser_manager.find_elements_safe(By.XPATH, AMOUNT_XPATH)
+            )
+            
+            amount_filled = False
+            for inp in amount_inputs:
+                try:
+                    if inp.is_enabled():
+                        logger.info("🎯 Filling amount field")
+                        success = await human_type_text(browser_manager, inp, "1000", 0.1, 0.3)
+                        if success:
+                            logger.info("✅ Amount filled successfully")
+                            amount_filled = True
+                            break
+                except ELEMENT_ERRORS:
+                    pass
+            
+            if not amount_filled:
+                logger.error("❌ Could not fill amount")
+                return False
+            
+            await browser_manager.wait_for_element(By.XPATH, TJS_XPATH, timeout=10)
+            screenshot_tasks.append(asyncio.create_task(browser_manager.take_screenshot("step3_amount_filled.jpg")))
+            
+            # Шаг 4: Выбор валюты TJS
+            logger.info("📍 Step 4: Select TJS currency")
+            
+            # ОПТИМИЗИРОВАНО: Используем только рабочий селектор для TJS
+            elements = await browser_manager.find_elements_safe(By.XPATH, TJS_XPATH)
+            logger.debug("🚀 OPTIMIZED: Found %d TJS elements with working selector", len(elements))
+            
+            tjs_selected = False
+            for element in await visible_elements(browser_manager, elements):
+                try:
+                    if element.is_enabled():
+                        logger.info("🎯 Clicking TJS currency button")
+                        await asyncio.sleep(random.uniform(0.3, 0.7))
+                        
+                        await click_and_wait_for(browser_manager, element, TRANSFER_METHOD_XPATH)
                         logger.info("✅ Successfully selected TJS currency")
                         tjs_selected = True
                         break
-                    else:
-                        browser_manager.driver.execute_script("arguments[0].click();", element)
-                        logger.info("✅ Successfully selected TJS currency via JavaScript")
-                        tjs_selected = True
-                        break
-            except Exception as e:
-                logger.debug(f"TJS element click failed: {e}")
-                continue
-        
-        if not tjs_selected:
-            logger.warning("⚠️ Could not select TJS currency, continuing...")
-        
-        await asyncio.sleep(3)
-        await browser_manager.take_screenshot("step4_currency_selected.png")
-        
-        # Шаг 5: Выбор способа перевода "Все карты"
-        logger.info("📍 Step 5: Select 'Все карты' transfer method")
-        
-        # ОПТИМИЗИРОВАНО: Используем только рабочий селектор
-        working_selector = "//*[contains(text(), 'Выберите способ') or contains(text(), 'способ')]"
-        elements = await browser_manager.find_elements_safe(By.XPATH, working_selector)
-        logger.info(f"🚀 OPTIMIZED: Found {len(elements)} transfer method elements with working selector")
-        
-        method_dropdown_clicked = False
-        for element in elements:
-            try:
-                if element.is_displayed():
+                except ELEMENT_ERRORS as e:
+                    logger.debug("TJS element click failed: %s", e)
+                    continue
+            
+            if not tjs_selected:
+                logger.warning("⚠️ Could not select TJS currency, continuing...")
+                await browser_manager.wait_for_element(By.XPATH, TRANSFER_METHOD_XPATH, timeout=10)
+            
+            screenshot_tasks.append(asyncio.create_task(browser_manager.take_screenshot("step4_currency_selected.jpg")))
+            
+            # Шаг 5: Выбор способа перевода "Все карты"
+            logger.info("📍 Step 5: Select 'Все карты' transfer method")
+            
+            # ОПТИМИЗИРОВАНО: Используем только рабочий селектор
+            elements = await browser_manager.find_elements_safe(By.XPATH, TRANSFER_METHOD_XPATH)
+            logger.debug("🚀 OPTIMIZED: Found %d transfer method elements with working selector", len(elements))
+            
+            method_dropdown_clicked = False
+            for element in await visible_elements(browser_manager, elements):
+                try:
                     logger.info("🎯 Clicking transfer method dropdown")
                     await asyncio.sleep(random.uniform(0.3, 0.7))
                     
+                    await click_and_wait_for(browser_manager, element, VSE_KARTY_XPATH)
+                    logger.info("✅ Successfully clicked transfer method dropdown")
+                    method_dropdown_clicked = True
+                    break
+                except ELEMENT_ERRORS:
+                    continue
+            
+            screenshot_tasks.append(asyncio.create_task(browser_manager.take_screenshot("step5_transfer_method_dropdown.jpg")))
+            
+            # Теперь ищем "Все карты" в открывшемся списке: один union-XPath,
+            # берем первый видимый и активный из всех совпадений (скрытый первый не блокирует шаг)
+            vse_karty_selected = False
+            element = await first_visible_enabled(browser_manager, VSE_KARTY_XPATH)
+            if element is None:
+                logger.debug("Все карты option did not become clickable")
+            else:
+                try:
+                    logger.info("🎯 Clicking Все карты option")
+                    await asyncio.sleep(random.uniform(0.3, 0.7))
+                    
                     if await browser_manager.click_element_safe(element):
-                        logger.info("✅ Successfully clicked transfer method dropdown")
-                        method_dropdown_clicked = True
-                        break
+                        logger.info("✅ Successfully selected Все карты")
                     else:
                         browser_manager.driver.execute_script("arguments[0].click();", element)
-                        logger.info("✅ Successfully clicked transfer method dropdown via JavaScript")
-                        method_dropdown_clicked = True
-                        break
-            except:
-                continue
-        
-        await asyncio.sleep(3)
-        await browser_manager.take_screenshot("step5_transfer_method_dropdown.png")
-        
-        # Теперь ищем "Все карты" в открывшемся списке
-        vse_karty_selectors = [
-            "//*[contains(text(), 'Все карты')]",
-            "//div[contains(text(), 'Все карты')]",
-            "//span[contains(text(), 'Все карты')]",
-            "//li[contains(text(), 'Все карты')]",
-            "//*[contains(@class, 'option') and contains(text(), 'Все карты')]"
-        ]
-        
-        vse_karty_selected = False
-        for selector in vse_karty_selectors:
-            elements = await browser_manager.find_elements_safe(By.XPATH, selector)
-            logger.info(f"Found {len(elements)} Все карты elements with selector: {selector}")
+                        logger.info("✅ Successfully selected Все карты via JavaScript")
+                    vse_karty_selected = True
+                except ELEMENT_ERRORS as e:
+                    logger.debug("Все карты click failed: %s", e)
             
-            for element in elements:
-                try:
-                    if element.is_displayed():
-                        logger.info("🎯 Clicking Все карты option")
-                        await asyncio.sleep(random.uniform(0.3, 0.7))
-                        
-                        browser_manager.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        await asyncio.sleep(0.3)
-                        
-                        if await browser_manager.click_element_safe(element):
-                            logger.info("✅ Successfully selected Все карты")
-                            vse_karty_selected = True
-                            break
-                        else:
-                            browser_manager.driver.execute_script("arguments[0].click();", element)
-                            logger.info("✅ Successfully selected Все карты via JavaScript")
-                            vse_karty_selected = True
-                            break
-                except Exception as e:
-                    logger.debug(f"Korti Milli element click failed: {e}")
-                    continue
+            if not vse_karty_selected:
+                logger.warning("⚠️ Could not select Все карты, continuing...")
             
-            if vse_karty_selected:
-                break
-        
-        if not vse_karty_selected:
-            logger.warning("⚠️ Could not select Все карты, continuing...")
-        
-        await asyncio.sleep(3)
-        await browser_manager.take_screenshot("step5_method_selected.png")
-        
-        # Шаг 6: Нажать кнопку "ПРОДОЛЖИТЬ"
-        logger.info("📍 Step 6: Click 'ПРОДОЛЖИТЬ' button")
-        
-        continue_buttons = await browser_manager.find_elements_safe(By.TAG_NAME, "button")
-        continue_clicked = False
-        
-        for i, btn in enumerate(continue_buttons):
-            try:
-                text = await browser_manager.get_element_text(btn)
-                if text and "ПРОДОЛЖИТЬ" in text.upper():
-                    logger.info(f"�� Found continue button: '{text}'")
-                    await asyncio.sleep(random.uniform(0.5, 1.0))
-                    
-                    if await browser_manager.click_element_safe(btn):
-                        logger.info(f"✅ Successfully clicked continue button")
-                        continue_clicked = True
-                        break
-            except:
-                pass
-        
-        if not continue_clicked:
-            logger.warning("⚠️ Could not find continue button")
-        
-        await asyncio.sleep(5)
-        await browser_manager.take_screenshot("final_complete_result.png")
-        
-        logger.info("✅ Complete automation flow finished!")
-        return True
+            await wait_for_button_text(browser_manager, CONTINUE_TEXT)
+            screenshot_tasks.append(asyncio.create_task(browser_manager.take_screenshot("step5_method_selected.jpg")))
+            
+            # Шаг 6: Нажать кнопку "ПРОДОЛЖИТЬ"
+            logger.info("📍 Step 6: Click 'ПРОДОЛЖИТЬ' button")
+            
+            continue_clicked = False
+            btn = await find_button_by_text(browser_manager, CONTINUE_TEXT)
+            
+            if btn:
+                logger.info("🎯 Found continue button")
+                await asyncio.sleep(random.uniform(0.5, 1.0))
+                
+                if await browser_manager.click_element_safe(btn):
+                    logger.info("✅ Successfully clicked continue button")
+                    continue_clicked = True
+            
+            if not continue_clicked:
+                logger.warning("⚠️ Could not find continue button")
+            
+            await browser_manager.wait_for_page_ready(timeout=10)
+            await browser_manager.take_screenshot("final_complete_result.png")
+            
+            logger.info("✅ Complete automation flow finished!")
+            return True
+        finally:
+            # Фоновые скриншоты дописываются до закрытия браузера - и при раннем return False
+            await asyncio.gather(*screenshot_tasks, return_exceptions=True)
 
 async def main():
     """Главная функция тестирования"""
     logger.info("🚀 Starting COMPLETE automation test...")
     
     result = await test_complete_flow()
-    logger.info(f"📊 Complete test: {'✅ PASSED' if result else '❌ FAILED'}")
+    logger.info("📊 Complete test: %s", '✅ PASSED' if result else '❌ FAILED')
     
     if result:
         logger.info("🎉 COMPLETE AUTOMATION PASSED!")
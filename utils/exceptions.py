@@ -5,84 +5,84 @@ Custom exceptions for MultiTransfer Bot
 
 class MultiTransferBotError(Exception):
     """Базовое исключение для бота"""
-    pass
+    __slots__ = ()
 
 
 class PaymentError(MultiTransferBotError):
     """Ошибки связанные с платежами"""
-    pass
+    __slots__ = ()
 
 
 class AutomationError(MultiTransferBotError):
     """Ошибки браузерной автоматизации"""
-    pass
+    __slots__ = ()
 
 
 class ProxyError(MultiTransferBotError):
     """Ошибки прокси-серверов"""
-    pass
+    __slots__ = ()
 
 
 class ValidationError(MultiTransferBotError):
     """Ошибки валидации данных"""
-    pass
+    __slots__ = ()
 
 
 class DatabaseError(MultiTransferBotError):
     """Ошибки базы данных"""
-    pass
+    __slots__ = ()
 
 
 class ConfigurationError(MultiTransferBotError):
     """Ошибки конфигурации"""
-    pass
+    __slots__ = ()
 
 
 class CaptchaError(MultiTransferBotError):
     """Ошибки решения капчи"""
-    pass
+    __slots__ = ()
 
 
 class BrowserError(AutomationError):
     """Ошибки браузера"""
-    pass
+    __slots__ = ()
 
 
 class WebDriverError(AutomationError):
     """Ошибки WebDriver"""
-    pass
+    __slots__ = ()
 
 
 class ElementNotFoundError(AutomationError):
     """Элемент не найден на странице"""
-    pass
+    __slots__ = ()
 
 
 class TimeoutError(AutomationError):
     """Превышено время ожидания"""
-    pass
+    __slots__ = ()
 
 
 class NetworkError(MultiTransferBotError):
     """Сетевые ошибки"""
-    pass
+    __slots__ = ()
 
 
 class RateLimitError(MultiTransferBotError):
     """Превышен лимит запросов"""
-    pass
+    __slots__ = ()
 
 
 class UserNotFoundError(DatabaseError):
     """Пользователь не найден"""
-    pass
+    __slots__ = ()
 
 
 class RequisitesNotFoundError(DatabaseError):
     """Реквизиты пользователя не найдены"""
-    pass
+    __slots__ = ()
 
 
 class PassportDataNotFoundError(DatabaseError):
     """Паспортные данные не найдены"""
-    pass
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
@@ -4,7 +4,11 @@ Performance Optimizations для MultiTransfer Bot
 """
 
 import asyncio
+import random
+import time
+from contextlib import contextmanager
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 from typing import Dict, Any, List
 
 # 1. Конфигурация для config.yml (в виде комментария)
@@ -25,12 +29,30 @@ OPTIMIZED_DELAYS = {
 }
 
 # 3. Быстрые селекторы (использовать первыми)
+# XPath вычисляется в браузере, поэтому "компиляция" на стороне Python ничего
+# не дает - выигрыш в том, что все селекторы собраны в одном месте и
+# используются через get_optimized_selector.
 FAST_SELECTORS = {
     'transfer_abroad_btn': "//button[contains(text(), 'ПЕРЕВЕСТИ ЗА РУБЕЖ')]",
+    'tajikistan_select': "//span[text()='Таджикистан']/parent::div",
+    'amount_input': "//input[contains(@placeholder, 'RUB')]",
+    'currency_tjs': "//*[text()='TJS']",
+    'transfer_method_dropdown': "//*[contains(text(), 'Выберите способ') or contains(text(), 'способ')]",
     'continue_btn': "//button[contains(text(), 'ПРОДОЛЖИТЬ')]",
     'captcha_generic': "//div[contains(@class, 'captcha')]"
 }
 
+# Альтернативы одного шага объединены в union-XPath: браузер обходит DOM
+# один раз вместо отдельного find_elements на каждый вариант
+VSE_KARTY_SELECTORS = (
+    "//*[contains(text(), 'Все карты')]",
+    "//div[contains(text(), 'Все карты')]",
+    "//span[contains(text(), 'Все карты')]",
+    "//li[contains(text(), 'Все карты')]",
+    "//*[contains(@class, 'option') and contains(text(), 'Все карты')]",
+)
+VSE_KARTY_XPATH = " | ".join(VSE_KARTY_SELECTORS)
+
 # 4. Функция для заполнения поля (заглушка)
 async def fill_field_async(driver, field: str, value: str) -> bool:
     """Асинхронное заполнение поля формы"""
@@ -42,12 +64,23 @@ async def fill_field_async(driver, field: str, value: str) -> bool:
         return False
 
 # 5. Параллельное выполнение
-async def parallel_fill_form(driver, form_data: Dict[str, str]) -> List[Any]:
-    """Заполняет несколько полей параллельно"""
-    tasks = []
-    for field, value in form_data.items():
-        task = asyncio.create_task(fill_field_async(driver, field, value))
-        tasks.append(task)
+async def parallel_fill_form(driver, form_data: Dict[str, str], max_concurrency: int = 1) -> List[Any]:
+    """Заполняет несколько полей с ограничением параллелизма.
+    
+    Один WebDriver не потокобезопасен: одновременные команды к одной сессии
+    все равно сериализуются и могут перемешаться, поэтому по умолчанию
+    поля заполняются строго по одному (max_concurrency=1).
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def fill_with_limit(field: str, value: str) -> bool:
+        async with semaphore:
+            return await fill_field_async(driver, field, value)
+    
+    tasks = [
+        asyncio.create_task(fill_with_limit(field, value))
+        for field, value in form_data.items()
+    ]
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
     return results
@@ -56,36 +89,48 @@ async def parallel_fill_form(driver, form_data: Dict[str, str]) -> List[Any]:
 class SelectorCache:
     """Кэш для селекторов элементов"""
     
-    def __init__(self):
+    def __init__(self, ttl: float = 5.0):
+        # selector -> (element, время помещения в кэш)
         self.cache = {}
+        self.ttl = ttl
     
     def get_element(self, driver, selector: str):
         """Получить элемент из кэша или найти новый"""
-        if selector not in self.cache:
-            try:
-                self.cache[selector] = driver.find_element(By.XPATH, selector)
-            except Exception:
-                return None
-        return self.cache[selector]
+        entry = self.cache.get(selector)
+        if entry is not None:
+            element, cached_at = entry
+            if time.monotonic() - cached_at < self.ttl:
+                try:
+                    # После перехода на другую страницу элемент становится stale;
+                    # закрытое окно/сессия - тоже WebDriverException: ищем заново
+                    element.is_enabled()
+                    return element
+                except WebDriverException:
+                    pass
+            del self.cache[selector]
+        
+        try:
+            element = driver.find_element(By.XPATH, selector)
+        except Exception:
+            return None
+        self.cache[selector] = (element, time.monotonic())
+        return element
     
     def clear_cache(self):
         """Очистить кэш"""
         self.cache.clear()
 
 # 7. Оптимизированная проверка капчи
+CAPTCHA_QUICK_CSS = "div[class*=captcha], iframe[src*=captcha]"
+
 async def fast_captcha_check(driver) -> bool:
     """Быстрая проверка наличия капчи"""
     try:
-        # Проверяем только основные индикаторы
-        quick_selectors = [
-            "//div[contains(@class, 'captcha')]",
-            "//iframe[contains(@src, 'captcha')]"
-        ]
-        
-        for selector in quick_selectors:
-            if driver.find_elements(By.XPATH, selector):
-                return True
-        return False
+        # Проверяем только основные индикаторы - один CSS-запрос в браузере
+        return bool(driver.execute_script(
+            "return document.querySelector(arguments[0]) !== null;",
+            CAPTCHA_QUICK_CSS
+        ))
     except Exception:
         return False
 
@@ -103,20 +148,30 @@ class PerformanceMonitor:
     
     def __init__(self):
         self.start_times = {}
+        # Последняя измеренная длительность операции в секундах
+        self.durations = {}
+    
+    @contextmanager
+    def measure(self, operation: str):
+        """Замерить блок кода: with monitor.measure('form_fill'): ..."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.durations[operation] = (time.perf_counter_ns() - start) / 1e9
     
     def start_timer(self, operation: str):
         """Начать отсчет времени для операции"""
-        import time
-        self.start_times[operation] = time.time()
+        self.start_times[operation] = time.perf_counter_ns()
     
     def end_timer(self, operation: str) -> float:
         """Завершить отсчет времени и вернуть длительность"""
-        import time
-        if operation in self.start_times:
-            duration = time.time() - self.start_times[operation]
-            del self.start_times[operation]
-            return duration
-        return 0.0
+        start = self.start_times.pop(operation, None)
+        if start is None:
+            return 0.0
+        duration = (time.perf_counter_ns() - start) / 1e9
+        self.durations[operation] = duration
+        return duration
     
     def check_target_time(self, operation: str, duration: float) -> bool:
         """Проверить, уложились ли в целевое время"""
@@ -132,4 +187,25 @@ def get_optimized_selector(selector_type: str) -> str:
 
 def get_optimized_delay(delay_type: str) -> float:
     """Получить оптимизированную задержку"""
-    return OPTIMIZED_DELAYS.get(delay_type, 1.0)
\ No newline at end of file
+    return OPTIMIZED_DELAYS.get(delay_type, 1.0)
+
+# 11. Пул случайных задержек для посимвольного ввода
+class JitterPool:
+    """Заранее сгенерированные случайные числа, перебираемые по кругу"""
+    
+    def __init__(self, size: int = 4096):
+        # Размер - степень двойки: индекс переворачивается маской, без деления
+        if size <= 0 or size & (size - 1):
+            raise ValueError("size must be a power of two")
+        self._pool = [random.random() for _ in range(size)]
+        self._mask = size - 1
+        self._idx = 0
+    
+    def next(self, lo: float, hi: float) -> float:
+        """Следующая задержка в диапазоне [lo, hi)"""
+        u = self._pool[self._idx]
+        self._idx = (self._idx + 1) & self._mask
+        return lo + (hi - lo) * u
+
+# Общий пул на процесс: 4096 random() один раз при импорте, а не на каждый запуск автоматизации
+typing_jitter = JitterPool()
@@ -6,6 +6,19 @@ import re
 from typing import Any, Optional
 
 
+# Сумма цифр удвоенной цифры для алгоритма Луна: 5 -> 10 -> 1, 9 -> 18 -> 9
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+# Регулярные выражения компилируются один раз при импорте модуля
+_RE_CARD_SEPARATORS = re.compile(r'[\s\-]')
+_RE_DATE = re.compile(r'^\d{2}\.\d{2}\.\d{4}$')
+
+# Поддерживаемые значения (множества: проверка за O(1) без создания списка)
+_SUPPORTED_COUNTRIES = frozenset({'tajikistan', 'georgia', 'kyrgyzstan'})
+_SUPPORTED_BANKS = frozenset({'korti_milli', 'azizi_molia', 'bank_arvand', 'eskhata_bank'})
+_SUPPORTED_CURRENCIES = frozenset({'RUB', 'USD', 'EUR', 'TJS', 'KGS', 'GEL'})
+
+
 def validate_amount(amount: Any) -> bool:
     """
     Валидация суммы платежа
@@ -17,6 +30,13 @@ def validate_amount(amount: Any) -> bool:
         True если сумма валидна
     """
     try:
+        # Быстрый путь: целые числа и строки из цифр без преобразования во float
+        # (int() может отказать на строке длиннее 4300 цифр - это ValueError ниже)
+        if isinstance(amount, int):
+            return 300 <= amount <= 120000
+        if isinstance(amount, str) and amount.isdecimal():
+            return 300 <= int(amount) <= 120000
+        
         amount_float = float(amount)
         
         # Проверяем границы
@@ -49,7 +69,7 @@ def validate_card_number(card_number: str) -> bool:
         return False
     
     # Убираем пробелы и дефисы
-    clean_number = re.sub(r'[\s\-]', '', card_number)
+    clean_number = _RE_CARD_SEPARATORS.sub('', card_number)
     
     # Проверяем что только цифры
     if not clean_number.isdigit():
@@ -73,16 +93,14 @@ def _luhn_check(card_number: str) -> bool:
     Returns:
         True если номер проходит проверку Луна
     """
-    def digits_of(n):
-        return [int(d) for d in str(n)]
-    
-    digits = digits_of(card_number)
-    odd_digits = digits[-1::-2]
-    even_digits = digits[-2::-2]
-    
-    checksum = sum(odd_digits)
-    for d in even_digits:
-        checksum += sum(digits_of(d*2))
+    checksum = 0
+    # Идем справа налево: каждая вторая цифра удваивается (через таблицу)
+    for i, char in enumerate(reversed(card_number)):
+        digit = ord(char) - 48
+        if not 0 <= digit <= 9:
+            # Не-ASCII цифры (isdigit() их пропускает) - как раньше через int()
+            digit = int(char)
+        checksum += _LUHN_DOUBLED[digit] if i & 1 else digit
     
     return checksum % 10 == 0
 
@@ -101,7 +119,7 @@ def validate_phone_number(phone: str) -> bool:
         return False
     
     # Убираем все кроме цифр
-    clean_phone = re.sub(r'[^\d]', '', phone)
+    clean_phone = ''.join(c for c in phone if c.isdecimal())
     
     # Проверяем длину (российские номера)
     if len(clean_phone) == 11 and clean_phone.startswith('7'):
@@ -166,8 +184,7 @@ def validate_date_format(date_str: str) -> bool:
         return False
     
     # Проверяем формат ДД.ММ.ГГГГ
-    pattern = r'^\d{2}\.\d{2}\.\d{4}$'
-    if not re.match(pattern, date_str):
+    if not _RE_DATE.match(date_str):
         return False
     
     try:
@@ -197,8 +214,7 @@ def validate_country(country: str) -> bool:
     Returns:
         True если страна поддерживается
     """
-    supported_countries = ['tajikistan', 'georgia', 'kyrgyzstan']
-    return country.lower() in supported_countries
+    return country.lower() in _SUPPORTED_COUNTRIES
 
 
 def validate_bank(bank: str) -> bool:
@@ -211,8 +227,7 @@ def validate_bank(bank: str) -> bool:
     Returns:
         True если банк поддерживается
     """
-    supported_banks = ['korti_milli', 'azizi_molia', 'bank_arvand', 'eskhata_bank']
-    return bank.lower() in supported_banks
+    return bank.lower() in _SUPPORTED_BANKS
 
 
 def validate_currency(currency: str) -> bool:
@@ -225,5 +240,4 @@ def validate_currency(currency: str) -> bool:
     Returns:
         True если валюта поддерживается
     """
-    supported_currencies = ['RUB', 'USD', 'EUR', 'TJS', 'KGS', 'GEL']
-    return currency.upper() in supported_currencies
\ No newline at end of file
+    return currency.upper() in _SUPPORTED_CURRENCIES
\ No newline at end of file
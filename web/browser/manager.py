@@ -5,20 +5,36 @@ Supports both headless (with Xvfb) and non-headless modes for production
 """
 
 import asyncio
+import atexit
+import base64
+import functools
+import hashlib
+import json
 import logging
 import random
 import time
 import os
-import subprocess
+import re
+import shutil
+import signal
+import string
+import tempfile
+import uuid
 import platform
-from typing import Optional, List, Dict, Any
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Callable, Set
+from urllib.parse import urlsplit
 
+import aiofiles
 import undetected_chromedriver as uc
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException, NoAlertPresentException
 
 from core.proxy.manager import ProxyManager
 from core.proxy.manager import ProxyInfo
@@ -26,9 +42,292 @@ from web.captcha.solver import CaptchaSolver
 
 logger = logging.getLogger(__name__)
 
+# Proxy auth extension: manifest is constant, background.js only varies by credentials
+_PROXY_AUTH_MANIFEST = json.dumps({
+    "version": "1.0",
+    "manifest_version": 2,
+    "name": "Proxy Auth",
+    "permissions": [
+        "proxy",
+        "tabs",
+        "unlimitedStorage",
+        "storage",
+        "<all_urls>",
+        "webRequest",
+        "webRequestBlocking"
+    ],
+    "background": {
+        "scripts": ["background.js"]
+    },
+    "minimum_chrome_version": "22.0.0"
+})
+
+# Настройка Anti-Captcha плагина одним async-скриптом: ждет появления плагина,
+# настраивает его и возвращает результат (API-ключ передается аргументом)
+_PLUGIN_CONFIG_JS = """
+var apiKey = arguments[0];
+var done = arguments[arguments.length - 1];
+var poll = null;
+var timer = setTimeout(function() {
+    clearInterval(poll);
+    console.error('Anti-Captcha plugin not detected');
+    done('plugin_not_found');
+}, 15000);
+
+poll = setInterval(function() {
+    // Check for different plugin object names
+    var pluginObj = window.AntiCaptcha || 
+                   window.antiCaptchaPlugin || 
+                   window.anticaptcha ||
+                   window.AC;
+    if (!pluginObj) {
+        return;
+    }
+    clearInterval(poll);
+    clearTimeout(timer);
+
+    try {
+        // Configure API key
+        if (typeof pluginObj.setAPIKey === 'function') {
+            pluginObj.setAPIKey(apiKey);
+        }
+
+        // Enable automatic solving
+        if (typeof pluginObj.setAutoSolveEnabled === 'function') {
+            pluginObj.setAutoSolveEnabled(true);
+        }
+
+        // Set solve timeout
+        if (typeof pluginObj.setTimeout === 'function') {
+            pluginObj.setTimeout(120);
+        }
+
+        // Enable debug mode for development
+        if (typeof pluginObj.setDebugEnabled === 'function') {
+            pluginObj.setDebugEnabled(true);
+        }
+
+        console.log('Anti-Captcha plugin configured successfully');
+        done('plugin_configured_success');
+    } catch (e) {
+        console.error('Anti-Captcha plugin configuration error:', e);
+        done('plugin_configured_error');
+    }
+}, 100);
+"""
+
+# Пакетное чтение текста/атрибутов: один execute_script вместо запроса на элемент
+_BULK_TEXT_JS = "return arguments[0].map(function (e) { return e ? (e.innerText || '') : ''; });"
+
+# Как WebElement.get_attribute: булевы атрибуты (disabled, checked...) дают 'true' или '',
+# остальные - сначала свойство DOM (value...), затем атрибут
+_BULK_ATTRIBUTES_JS = """
+var attrs = arguments[1];
+var BOOLEAN = ['allowfullscreen', 'async', 'autofocus', 'autoplay', 'checked', 'controls',
+               'default', 'defer', 'disabled', 'formnovalidate', 'hidden', 'indeterminate',
+               'ismap', 'loop', 'multiple', 'muted', 'nomodule', 'novalidate', 'open',
+               'readonly', 'required', 'reversed', 'selected'];
+var PROPERTY = {allowfullscreen: 'allowFullscreen', formnovalidate: 'formNoValidate', ismap: 'isMap',
+                nomodule: 'noModule', novalidate: 'noValidate', readonly: 'readOnly'};
+return arguments[0].map(function (e) {
+    var out = {};
+    attrs.forEach(function (a) {
+        var v = null;
+        var name = a.toLowerCase();
+        if (e && BOOLEAN.indexOf(name) !== -1) {
+            var state = e[PROPERTY[name] || name];
+            if ((name === 'checked' || name === 'selected') && typeof state === 'boolean') {
+                // Текущее состояние чекбокса/опции, а не исходный атрибут
+                v = state ? 'true' : null;
+            } else {
+                v = (state === true || e.hasAttribute(name)) ? 'true' : null;
+            }
+        } else if (e) {
+            var p = e[a];
+            v = (p !== undefined && p !== null && typeof p !== 'object' && typeof p !== 'function')
+                ? String(p) : e.getAttribute(a);
+        }
+        out[a] = v || '';
+    });
+    return out;
+});
+"""
+
+# Тяжелые ресурсы, которые не нужны для заполнения форм (browser.block_resources).
+# CSS не блокируем: без стилей ломаются проверки видимости элементов
+_IMAGE_URL_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp")
+DEFAULT_BLOCKED_URLS = [
+    *_IMAGE_URL_PATTERNS,
+    "*.woff", "*.woff2", "*.ttf",
+    "*.mp4",
+]
+
+_PROXY_AUTH_BACKGROUND_JS = string.Template("""
+var config = {
+    mode: "fixed_servers",
+    rules: {
+        singleProxy: {
+            scheme: "http",
+            host: "$host",
+            port: parseInt("$port")
+        },
+        bypassList: ["localhost"]
+    }
+};
+
+chrome.proxy.settings.set({value: config, scope: "regular"}, function() {});
+
+function callbackFn(details) {
+    return {
+        authCredentials: {
+            username: "$username",
+            password: "$password"
+        }
+    };
+}
+
+chrome.webRequest.onAuthRequired.addListener(
+    callbackFn,
+    {urls: ["<all_urls>"]},
+    ['blocking']
+);
+""")
+
+
+@contextmanager
+def _stopwatch():
+    """Measure a block with time.monotonic(); the yielded callable returns elapsed seconds"""
+    start = time.monotonic()
+    end = None
+    yield lambda: (end if end is not None else time.monotonic()) - start
+    end = time.monotonic()
+
+
+@dataclass
+class PooledDriver:
+    """Idle Chrome driver kept alive between BrowserManager sessions"""
+    driver: Any
+    proxy: Optional[ProxyInfo]
+    plugin_loaded: bool
+    uses: int
+    profile_dir: Optional[str] = None
+    auth_extension_path: Optional[str] = None
+    # Origins the last session navigated to - their storage is wiped on release
+    origins: Set[str] = field(default_factory=set)
+
+
+def _frame_origins(frame_tree: Dict[str, Any]) -> Set[str]:
+    """Security origins of a CDP Page.getFrameTree node and all its child frames"""
+    origins = {frame_tree["frame"].get("securityOrigin", "")}
+    for child in frame_tree.get("childFrames", ()):
+        origins |= _frame_origins(child)
+    return origins
+
+
+class BrowserPool:
+    """Process-wide pool of warm Chrome drivers (disabled while max_size == 0)"""
+    
+    def __init__(self, max_size: int = 0, max_uses: int = 20):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self._idle = deque()
+    
+    def __len__(self) -> int:
+        return len(self._idle)
+    
+    def acquire(self, predicate: Callable[[PooledDriver], bool] = lambda entry: True) -> Optional[PooledDriver]:
+        """Take the oldest idle driver matching predicate"""
+        for entry in self._idle:
+            if predicate(entry):
+                self._idle.remove(entry)
+                return entry
+        return None
+    
+    async def release(self, entry: PooledDriver) -> bool:
+        """Reset driver state and keep it warm; False means the caller must quit it"""
+        if entry.uses >= self.max_uses or len(self._idle) >= self.max_size:
+            return False
+        
+        def reset():
+            # Next session may belong to another user: nothing of this one may survive
+            driver = entry.driver
+            origins = set(entry.origins)
+            old_handles = driver.window_handles
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                origins |= _frame_origins(driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"])
+            
+            # Fresh tab; closing the old ones drops their sessionStorage and history
+            driver.switch_to.new_window('tab')
+            fresh_handle = driver.current_window_handle
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(fresh_handle)
+            
+            # localStorage, IndexedDB, Cache Storage, service workers... of every visited origin
+            for origin in origins:
+                if origin.startswith(("http://", "https://")):
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        
+        try:
+            await asyncio.to_thread(reset)
+        except Exception as e:
+            logger.debug(f"♻️ Pooled driver reset failed: {e}")
+            return False
+        
+        self._idle.append(entry)
+        logger.debug(f"♻️ Driver returned to pool ({len(self._idle)}/{self.max_size})")
+        return True
+    
+    def drain(self):
+        """Quit every idle driver"""
+        while self._idle:
+            entry = self._idle.popleft()
+            try:
+                entry.driver.quit()
+            except Exception as e:
+                logger.debug(f"🧹 Pooled driver quit error: {e}")
+            for path in (entry.profile_dir, entry.auth_extension_path):
+                if path:
+                    shutil.rmtree(path, ignore_errors=True)
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.drain)
+
+
 class BrowserManager:
     """Browser manager with proxy support, fallback capabilities, and Anti-Captcha plugin"""
     
+    # Путь к Xvfb ищется один раз на процесс ('' - не найден)
+    _xvfb_path: Optional[str] = None
+    
+    # Plugin availability per plugin path - files don't change during a run
+    _plugin_availability: Dict[str, bool] = {}
+    _EMPTY_API_KEY_RE = re.compile(rb"antiCapthaPredefinedApiKey\s*=\s*''")
+    
+    # Минимальные флаги для совместимости с macOS + undetected-chromedriver
+    _PLUGIN_CHROME_ARGS = (
+        "--disable-web-security",
+        "--allow-running-insecure-content",
+        "--disable-blink-features=AutomationControlled",
+    )
+    
+    # Используем только необходимые prefs
+    _CHROME_PREFS = {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_settings.popups": 0,
+    }
+    # Профиль может переходить между сессиями (browser_pool): автозаполнение не сохраняем,
+    # в том числе без плагина - паспортные и карточные поля не должны достаться следующему
+    _NO_AUTOFILL_PREFS = {
+        "autofill.profile_enabled": False,
+        "autofill.credit_card_enabled": False,
+    }
+    
     def __init__(self, config: Dict[str, Any], proxy_manager: Optional[ProxyManager] = None):
         self.config = config
         self.proxy_manager = proxy_manager
@@ -42,11 +341,15 @@ class BrowserManager:
         self.user_agents = browser_config.get('user_agents', [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
         ])
+        self.block_resources = browser_config.get('block_resources', False)
+        self.blocked_urls = browser_config.get('blocked_urls', DEFAULT_BLOCKED_URLS)
         
         # Captcha settings
         captcha_config = config.get('captcha', {})
         self.captcha_plugin_enabled = captcha_config.get('plugin_enabled', True)
         self.captcha_plugin_path = captcha_config.get('plugin_path', 'plugins')
+        # Абсолютный путь фиксируется при создании (os.getcwd() не меняется между запусками)
+        self.captcha_plugin_abspath = os.path.abspath(self.captcha_plugin_path)
         self.captcha_api_key = captcha_config.get('api_key')
         
         # ИСПРАВЛЕНО: Создаем CaptchaSolver как в legacy режиме (MultiTransferAutomation)
@@ -60,17 +363,82 @@ class BrowserManager:
         self.max_retries = 3
         self.retry_delay = 2
         
+        # Driver pool settings (pool_size: 0 - каждый сеанс запускает свой Chrome)
+        self.pool_size = browser_config.get('pool_size', 0)
+        if self.pool_size:
+            browser_pool.max_size = max(browser_pool.max_size, self.pool_size)
+            browser_pool.max_uses = browser_config.get('pool_max_uses', browser_pool.max_uses)
+        
         # Browser instance
         self.driver = None
+        self.driver_uses = 0
+        self.auth_extension_path = None
+        # Расширение прокси у каждого менеджера свое: close() другого менеджера его не удалит
+        self.instance_id = uuid.uuid4().hex[:8]
+        # Профиль Chrome переживает restart_browser: DNS/TLS/HTTP-кэш остаются теплыми
+        self.profile_dir = self._new_profile_dir()
+        self.visited_origins: Set[str] = set()
         self.current_proxy = None
         self.fallback_mode = False
         self.plugin_loaded = False
         self.xvfb_display = None
+        self.xvfb_process = None
+        
+        # Chrome arguments that don't change between starts
+        # In production with Xvfb, we run non-headless for plugin support
+        base_args = ["--headless=new"] if self.headless and not self.use_xvfb else []
+        base_args += [
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            f"--window-size={self.window_size}",
+        ]
+        self._base_chrome_args = tuple(base_args)
+        
+        # Dedicated WebDriver thread: keeps blocking driver calls off the event loop
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Pool refill runs in the background; filler siblings only launch new Chrome
+        self._refill_task: Optional[asyncio.Task] = None
+        # Fire-and-forget tasks (recycled drivers): strong refs until done
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._pool_filler = False
+        
+        # (monotonic time, result) of the last is_alive probe
+        self._alive_cache: Optional[tuple] = None
+        # Monotonic time of the last handle_alert that found no alert
+        self._no_alert_at = 0.0
+        
+        # get_status fields fixed at init (xvfb_display / captcha_plugin_enabled change at start)
+        self._status_static = {
+            "xvfb_mode": self.use_xvfb,
+            "headless": self.headless,
+            "window_size": self.window_size,
+            "environment": self.environment,
+        }
         
         logger.info("🔧 BrowserManager initialized with proxy and captcha plugin support")
         logger.info(f"🌍 Environment: {self.environment}")
         logger.info(f"📺 Xvfb mode: {self.use_xvfb}")
     
+    @staticmethod
+    def _new_profile_dir() -> str:
+        """Path for a per-manager Chrome profile (created by Chrome on first start)"""
+        return os.path.join(tempfile.gettempdir(), f"bm_profile_{uuid.uuid4().hex[:8]}")
+    
+    async def _remove_profile_dir(self):
+        """Delete the Chrome profile on real shutdown (not on restart)"""
+        if self.profile_dir:
+            await asyncio.to_thread(shutil.rmtree, self.profile_dir, True)
+            logger.debug("🧹 Chrome profile cleaned up")
+    
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """Run a blocking WebDriver call on this manager's dedicated thread"""
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(func, *args))
+    
     async def __aenter__(self):
         """Async context manager entry"""
         return self
@@ -80,60 +448,84 @@ class BrowserManager:
         await self.close()
     
     def _check_plugin_availability(self) -> bool:
-        """Check if Anti-Captcha plugin is available"""
+        """Check if Anti-Captcha plugin is available (cached per plugin path)"""
         if not self.captcha_plugin_enabled:
             return False
         
-        plugin_path = os.path.abspath(self.captcha_plugin_path)
+        plugin_path = self.captcha_plugin_abspath
+        available = self._plugin_availability.get(plugin_path)
+        if available is None:
+            available = self._plugin_availability[plugin_path] = self._scan_plugin(plugin_path)
+        return available
+    
+    @classmethod
+    def clear_plugin_cache(cls):
+        """Forget cached plugin availability (e.g. after editing the plugin config)"""
+        cls._plugin_availability.clear()
+    
+    def _scan_plugin(self, plugin_path: str) -> bool:
+        """Read plugin files and check that the API key is configured"""
         manifest_path = os.path.join(plugin_path, "manifest.json")
         config_path = os.path.join(plugin_path, "js", "config_ac_api_key.js")
         
-        if os.path.exists(manifest_path) and os.path.exists(config_path):
-            logger.info(f"✅ Anti-Captcha plugin found: {plugin_path}")
-            
-            # Check if API key is configured
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config_content = f.read()
-                    if "antiCapthaPredefinedApiKey = ''" in config_content:
-                        logger.warning("⚠️ API key not configured in plugin config file!")
-                        logger.info("💡 Edit: plugins/js/config_ac_api_key.js")
-                        return False
-                    else:
-                        logger.info("✅ API key configured in plugin")
-                        return True
-            except Exception as e:
-                logger.warning(f"⚠️ Could not read plugin config: {e}")
-                return False
-        else:
+        try:
+            # Один stat для manifest, конфиг читается байтами без отдельной проверки exists
+            os.stat(manifest_path)
+            with open(config_path, 'rb') as f:
+                config_content = f.read()
+        except FileNotFoundError:
             logger.warning(f"⚠️ Anti-Captcha plugin not found: {plugin_path}")
             logger.info("💡 Expected structure:")
             logger.info("   plugins/manifest.json")
             logger.info("   plugins/js/config_ac_api_key.js")
             return False
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read plugin config: {e}")
+            return False
+        
+        logger.info(f"✅ Anti-Captcha plugin found: {plugin_path}")
+        
+        # Check if API key is configured
+        if self._EMPTY_API_KEY_RE.search(config_content):
+            logger.warning("⚠️ API key not configured in plugin config file!")
+            logger.info("💡 Edit: plugins/js/config_ac_api_key.js")
+            return False
+        
+        logger.info("✅ API key configured in plugin")
+        return True
     
     async def _setup_xvfb(self) -> bool:
         """Setup Xvfb for headless plugin support in production"""
         if not self.use_xvfb:
             return True
         
+        # restart_browser: Xvfb переживает перезапуск Chrome, второй сервер не нужен
+        if self.xvfb_process is not None and self.xvfb_process.returncode is None:
+            logger.debug(f"🖥️ Xvfb already running on display {self.xvfb_display}")
+            return True
+        
         try:
             logger.info("🖥️ Setting up Xvfb for headless plugin support...")
             
-            # Check if Xvfb is available
-            result = subprocess.run(['which', 'xvfb-run'], capture_output=True, text=True)
-            if result.returncode != 0:
+            # Check if Xvfb is available (PATH lookup once per process, no subprocess)
+            if BrowserManager._xvfb_path is None:
+                BrowserManager._xvfb_path = shutil.which('Xvfb') or ''
+            if not BrowserManager._xvfb_path:
                 logger.error("❌ Xvfb not found. Install with: apt-get install -y xvfb")
                 return False
             
-            # Set display variable
-            display_num = random.randint(10, 99)
+            # Set display variable: random free display (no lock file) to avoid collisions
+            free_displays = [n for n in range(10, 100) if not os.path.exists(f"/tmp/.X{n}-lock")]
+            if not free_displays:
+                logger.error("❌ No free X display number for Xvfb")
+                return False
+            display_num = random.choice(free_displays)
             self.xvfb_display = f":{display_num}"
             os.environ['DISPLAY'] = self.xvfb_display
             
             # Start Xvfb server
             xvfb_cmd = [
-                'Xvfb', 
+                BrowserManager._xvfb_path,
                 self.xvfb_display,
                 '-screen', '0', '1920x1080x24',
                 '-ac',
@@ -142,17 +534,23 @@ class BrowserManager:
                 '-noreset'
             ]
             
-            self.xvfb_process = subprocess.Popen(
-                xvfb_cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
+            self.xvfb_process = await asyncio.create_subprocess_exec(
+                *xvfb_cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                # Own process group: cleanup can signal Xvfb and anything it spawned
+                start_new_session=True
             )
             
-            # Wait for Xvfb to start
-            await asyncio.sleep(2)
+            # Wait for Xvfb to create its display lock instead of a fixed sleep
+            lock_path = f"/tmp/.X{display_num}-lock"
+            deadline = time.monotonic() + 5
+            while (time.monotonic() < deadline and self.xvfb_process.returncode is None
+                   and not os.path.exists(lock_path)):
+                await asyncio.sleep(0.05)
             
             # Check if Xvfb is running
-            if self.xvfb_process.poll() is None:
+            if self.xvfb_process.returncode is None:
                 logger.info(f"✅ Xvfb started successfully on display {self.xvfb_display}")
                 return True
             else:
@@ -163,9 +561,134 @@ class BrowserManager:
             logger.error(f"❌ Xvfb setup error: {e}")
             return False
     
+    def _pool_enabled(self) -> bool:
+        """Pooling is skipped with Xvfb: the display is torn down on close()"""
+        return bool(self.pool_size) and not self.use_xvfb
+    
+    async def _acquire_pooled_driver(self, use_proxy: bool, exclude: Optional[ProxyInfo] = None) -> bool:
+        """Reuse a warm driver from the pool instead of launching Chrome"""
+        want_proxy = bool(use_proxy and self.proxy_manager)
+        
+        def matches(e: PooledDriver) -> bool:
+            if (e.proxy is not None) != want_proxy:
+                return False
+            # switch_proxy: нужен браузер с другим прокси
+            return exclude is None or e.proxy is None or (e.proxy.host, e.proxy.port) != (exclude.host, exclude.port)
+        
+        while True:
+            entry = browser_pool.acquire(matches)
+            if entry is None:
+                return False
+            
+            try:
+                await asyncio.to_thread(lambda: entry.driver.current_url)
+            except Exception:
+                logger.debug("♻️ Dropping dead pooled driver")
+                try:
+                    await asyncio.to_thread(entry.driver.quit)
+                except Exception:
+                    pass
+                for path in (entry.profile_dir, entry.auth_extension_path):
+                    if path:
+                        await asyncio.to_thread(shutil.rmtree, path, True)
+                continue
+            
+            if self.driver is None:
+                # Own profile/extension from an earlier start are not used by any running Chrome
+                for own, pooled in ((self.profile_dir, entry.profile_dir),
+                                    (self.auth_extension_path, entry.auth_extension_path)):
+                    if own and own != pooled:
+                        await asyncio.to_thread(shutil.rmtree, own, True)
+            
+            self.driver = entry.driver
+            self.driver_uses = entry.uses + 1
+            self.current_proxy = entry.proxy
+            self.plugin_loaded = entry.plugin_loaded
+            self.fallback_mode = entry.proxy is None
+            self.profile_dir = entry.profile_dir
+            self.auth_extension_path = entry.auth_extension_path
+            self.visited_origins = set()
+            logger.info(f"♻️ Reusing pooled browser (use {self.driver_uses}/{browser_pool.max_uses})")
+            return True
+    
+    async def _release_to_pool(self) -> bool:
+        """Hand the driver back to the pool instead of quitting it"""
+        if not self._pool_enabled() or not self.driver:
+            return False
+        
+        entry = PooledDriver(self.driver, self.current_proxy, self.plugin_loaded, self.driver_uses,
+                             self.profile_dir, self.auth_extension_path, self.visited_origins)
+        if not await browser_pool.release(entry):
+            return False
+        
+        # The profile and auth extension now belong to the pooled driver
+        self.driver = None
+        self.driver_uses = 0
+        self.plugin_loaded = False
+        self.profile_dir = self._new_profile_dir()
+        self.auth_extension_path = None
+        self.visited_origins = set()
+        return True
+    
+    async def prewarm_pool(self, count: int) -> int:
+        """Launch up to count browsers in sibling managers and park them in the pool"""
+        if not self._pool_enabled():
+            return 0
+        
+        count = min(count, browser_pool.max_size - len(browser_pool))
+        
+        async def warm_one() -> bool:
+            manager = BrowserManager(self.config, self.proxy_manager)
+            manager._pool_filler = True
+            try:
+                return await manager.start_browser(use_proxy=self.proxy_manager is not None)
+            finally:
+                # Success: the driver goes to the pool; failure: thread, profile and extension are freed
+                await manager.close()
+        
+        results = await asyncio.gather(*(warm_one() for _ in range(count)))
+        warmed = sum(results)
+        logger.info(f"♻️ Browser pool pre-warmed: {warmed}/{count}")
+        return warmed
+    
+    def _schedule_pool_refill(self):
+        """Top the pool back up in the background after taking a driver from it"""
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        missing = browser_pool.max_size - len(browser_pool)
+        if missing > 0:
+            self._refill_task = asyncio.create_task(self.prewarm_pool(missing))
+    
+    @staticmethod
+    async def _recycle_driver(driver, profile_dir: Optional[str], auth_extension_path: Optional[str]):
+        """Quit a replaced driver and remove its profile and auth extension off the hot path"""
+        try:
+            await asyncio.to_thread(driver.quit)
+        except Exception as e:
+            logger.debug(f"Recycled driver quit error: {e}")
+        for path in (profile_dir, auth_extension_path):
+            if path:
+                await asyncio.to_thread(shutil.rmtree, path, True)
+    
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """Run a coroutine off the hot path, keeping the task referenced and its errors logged"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+    
+    def _background_task_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Background browser task failed: {task.exception()}")
+    
     async def start_browser(self, use_proxy: bool = True) -> bool:
         """Start browser with optional proxy and Anti-Captcha plugin"""
         
+        if self._pool_enabled() and not self._pool_filler and await self._acquire_pooled_driver(use_proxy):
+            self._schedule_pool_refill()
+            return True
+        
         # Setup Xvfb if needed
         if self.use_xvfb:
             xvfb_success = await self._setup_xvfb()
@@ -210,10 +733,18 @@ class BrowserManager:
                 chrome_options = self._create_chrome_options(proxy)
                 
                 # Create driver
-                self.driver = uc.Chrome(options=chrome_options)
+                # keep_alive: one persistent HTTP connection pool to chromedriver for all commands
+                self.driver = await self._run_blocking(
+                    functools.partial(uc.Chrome, options=chrome_options, keep_alive=True)
+                )
+                self.driver_uses = 1
+                self._tune_command_connection()
                 self.driver.implicitly_wait(self.implicit_wait)
                 self.driver.set_page_load_timeout(self.page_load_timeout)
                 
+                if self.block_resources:
+                    await self._block_heavy_resources()
+                
                 # Configure Anti-Captcha plugin if loaded
                 if self.plugin_loaded:
                     await self._configure_anticaptcha_plugin()
@@ -246,19 +777,52 @@ class BrowserManager:
         logger.error(f"❌ Failed to start browser after {self.max_retries} attempts")
         return False
     
+    async def _block_heavy_resources(self):
+        """Block images, fonts and media via CDP: fewer bytes through the proxy"""
+        urls = list(self.blocked_urls)
+        if self.plugin_loaded:
+            # setBlockedURLs не умеет исключения по хосту, а плагину нужна картинка капчи
+            kept = [url for url in urls if url not in _IMAGE_URL_PATTERNS]
+            if len(kept) != len(urls):
+                logger.warning("⚠️ Anti-Captcha plugin loaded: image URLs are not blocked")
+            urls = kept
+        if not urls:
+            return
+        
+        try:
+            await self._run_blocking(self.driver.execute_cdp_cmd, "Network.enable", {})
+            await self._run_blocking(
+                self.driver.execute_cdp_cmd, "Network.setBlockedURLs", {"urls": urls}
+            )
+            logger.info(f"🚫 Blocking {len(urls)} resource URL patterns")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not enable resource blocking: {e}")
+    
+    def _tune_command_connection(self, maxsize: int = 10):
+        """Let overlapping WebDriver commands share keep-alive connections to chromedriver"""
+        try:
+            executor = self.driver.command_executor
+            if not getattr(executor, 'keep_alive', True):
+                # Без keep-alive selenium создает новый PoolManager на каждую команду
+                logger.warning("⚠️ WebDriver keep-alive is disabled")
+                return
+            conn = executor._conn
+            # По умолчанию urllib3 держит одно соединение: параллельная команда
+            # открывает новое TCP-соединение и пишет "connection pool is full"
+            conn.connection_pool_kw['maxsize'] = maxsize
+            conn.connection_pool_kw['block'] = False
+            conn.clear()
+        except Exception as e:
+            logger.debug(f"⚠️ Could not tune WebDriver connection pool: {e}")
+    
     def _create_chrome_options(self, proxy: Optional[ProxyInfo] = None) -> Options:
         """Create Chrome options with proxy, stealth settings, and Anti-Captcha plugin"""
         chrome_options = Options()
         
-        # Basic browser settings
-        # In production with Xvfb, we run non-headless for plugin support
-        if self.headless and not self.use_xvfb:
-            chrome_options.add_argument("--headless=new")
-        
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument(f"--window-size={self.window_size}")
+        # Basic browser settings (precomputed in __init__)
+        for argument in self._base_chrome_args:
+            chrome_options.add_argument(argument)
+        chrome_options.add_argument(f"--user-data-dir={self.profile_dir}")
         
         # User agent
         user_agent = random.choice(self.user_agents)
@@ -275,14 +839,13 @@ class BrowserManager:
             # (SSH туннель отключен в config.yml: use_ssh_tunnel: false)
             if proxy.user and proxy.password:
                 logger.info("🔧 Creating proxy authentication extension")
-                self._create_proxy_auth_extension(proxy.user, proxy.password)
+                extension_path = self._create_proxy_auth_extension(proxy.user, proxy.password)
                 
                 # Добавляем расширение прокси-аутентификации к уже загруженным расширениям
-                extension_path = os.path.join(os.getcwd(), 'proxy_auth_extension')
-                if os.path.exists(extension_path):
+                if extension_path:
                     if self.plugin_loaded:
                         # Комбинируем Anti-Captcha плагин + Proxy Auth расширение
-                        plugin_path = os.path.abspath(self.captcha_plugin_path)
+                        plugin_path = self.captcha_plugin_abspath
                         chrome_options.add_argument(f"--load-extension={plugin_path},{extension_path}")
                         logger.info("🔌 Loaded Anti-Captcha plugin + Proxy Auth extension")
                     else:
@@ -299,28 +862,19 @@ class BrowserManager:
         # Anti-Captcha plugin configuration - ВОССТАНАВЛИВАЕМ ДЛЯ БЫСТРОГО РЕШЕНИЯ CAPTCHA
         if self._check_plugin_availability():
             try:
-                plugin_path = os.path.abspath(self.captcha_plugin_path)
+                plugin_path = self.captcha_plugin_abspath
                 
                 # Загружаем ТОЛЬКО Anti-Captcha плагин (без конфликтов)
                 chrome_options.add_argument(f"--load-extension={plugin_path}")
                 
-                # Минимальные флаги для совместимости с macOS + undetected-chromedriver
-                chrome_options.add_argument("--disable-web-security")
-                chrome_options.add_argument("--allow-running-insecure-content")
-                chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+                for argument in self._PLUGIN_CHROME_ARGS:
+                    chrome_options.add_argument(argument)
                 
                 # REMOVE PROBLEMATIC OPTIONS FOR MACOS
                 # These options cause issues with undetected-chromedriver on macOS
                 # chrome_options.add_experimental_option("excludeSwitches", ["--disable-extensions", "--enable-automation"])
                 # chrome_options.add_experimental_option('useAutomationExtension', False)
                 
-                # Используем только необходимые prefs
-                prefs = {
-                    "profile.default_content_setting_values.notifications": 2,
-                    "profile.default_content_settings.popups": 0,
-                }
-                chrome_options.add_experimental_option("prefs", prefs)
-                
                 self.plugin_loaded = True
                 logger.info("🔌 Anti-Captcha plugin loaded (single extension mode)")
             except Exception as e:
@@ -329,79 +883,52 @@ class BrowserManager:
         else:
             self.plugin_loaded = False
         
+        prefs = dict(self._NO_AUTOFILL_PREFS)
+        if self.plugin_loaded:
+            prefs.update(self._CHROME_PREFS)
+        chrome_options.add_experimental_option("prefs", prefs)
+        
         return chrome_options
     
-    def _create_proxy_auth_extension(self, username: str, password: str):
-        """Создает временное расширение для аутентификации прокси"""
-        extension_dir = os.path.join(os.getcwd(), 'proxy_auth_extension')
+    def _create_proxy_auth_extension(self, username: str, password: str) -> Optional[str]:
+        """Создает расширение для аутентификации прокси (одно на менеджер и набор учетных данных)"""
+        host = self.current_proxy.host if self.current_proxy else ''
+        port = self.current_proxy.port if self.current_proxy else ''
+        
+        # Каталог по хэшу учетных данных: при повторных запусках файлы не переписываются
+        key = hashlib.sha1(f"{username}:{password}:{host}:{port}".encode()).hexdigest()[:12]
+        extension_dir = os.path.join(tempfile.gettempdir(), f"proxy_auth_{self.instance_id}_{key}")
+        manifest_path = os.path.join(extension_dir, 'manifest.json')
+        background_path = os.path.join(extension_dir, 'background.js')
         
         try:
-            # Создаем директорию расширения
-            os.makedirs(extension_dir, exist_ok=True)
-            
-            # Создаем manifest.json
-            manifest = {
-                "version": "1.0",
-                "manifest_version": 2,
-                "name": "Proxy Auth",
-                "permissions": [
-                    "proxy",
-                    "tabs",
-                    "unlimitedStorage",
-                    "storage",
-                    "<all_urls>",
-                    "webRequest",
-                    "webRequestBlocking"
-                ],
-                "background": {
-                    "scripts": ["background.js"]
-                },
-                "minimum_chrome_version": "22.0.0"
-            }
-            
-            with open(os.path.join(extension_dir, 'manifest.json'), 'w') as f:
-                import json
-                json.dump(manifest, f)
-            
-            # Создаем background.js для аутентификации
-            background_js = f"""
-var config = {{
-    mode: "fixed_servers",
-    rules: {{
-        singleProxy: {{
-            scheme: "http",
-            host: "{self.current_proxy.host if hasattr(self, 'current_proxy') and self.current_proxy else ''}",
-            port: parseInt("{self.current_proxy.port if hasattr(self, 'current_proxy') and self.current_proxy else ''}")
-        }},
-        bypassList: ["localhost"]
-    }}
-}};
-
-chrome.proxy.settings.set({{value: config, scope: "regular"}}, function() {{}});
-
-function callbackFn(details) {{
-    return {{
-        authCredentials: {{
-            username: "{username}",
-            password: "{password}"
-        }}
-    }};
-}}
-
-chrome.webRequest.onAuthRequired.addListener(
-    callbackFn,
-    {{urls: ["<all_urls>"]}},
-    ['blocking']
-);
-"""
-            
-            with open(os.path.join(extension_dir, 'background.js'), 'w') as f:
-                f.write(background_js)
+            if self.auth_extension_path and self.auth_extension_path != extension_dir:
+                # Учетные данные сменились - старое расширение больше не нужно (Chrome уже закрыт)
+                shutil.rmtree(self.auth_extension_path, ignore_errors=True)
+                self.auth_extension_path = None
+            
+            if not (os.path.isfile(manifest_path) and os.path.isfile(background_path)):
+                # Только владелец может читать учетные данные прокси
+                os.makedirs(extension_dir, mode=0o700, exist_ok=True)
+                
+                with open(manifest_path, 'w') as f:
+                    f.write(_PROXY_AUTH_MANIFEST)
+                
+                with open(background_path, 'w') as f:
+                    f.write(_PROXY_AUTH_BACKGROUND_JS.substitute(
+                        host=host, port=port, username=username, password=password
+                    ))
+                
+                logger.info(f"✅ Proxy auth extension created: {extension_dir}")
+            else:
+                logger.debug(f"♻️ Reusing proxy auth extension: {extension_dir}")
             
-            logger.info(f"✅ Proxy auth extension created: {extension_dir}")
+            self.auth_extension_path = extension_dir
+            return extension_dir
             
         except Exception as e:
             logger.error(f"❌ Failed to create proxy auth extension: {e}")
+            return None
     
     async def _configure_anticaptcha_plugin(self) -> bool:
         """Configure Anti-Captcha plugin after browser startup"""
@@ -411,87 +938,15 @@ chrome.webRequest.onAuthRequired.addListener(
         try:
             logger.info("🔧 Configuring Anti-Captcha plugin...")
             
-            # Wait for plugin to initialize
-            await asyncio.sleep(3)
-            
-            # Configure plugin via JavaScript
-            config_script = f"""
-            // Wait for plugin to load
-            var attempts = 0;
-            var maxAttempts = 10;
-            
-            function configurePlugin() {{
-                // Check for different plugin object names
-                var pluginObj = window.AntiCaptcha || 
-                               window.antiCaptchaPlugin || 
-                               window.anticaptcha ||
-                               window.AC;
-                
-                if (pluginObj) {{
-                    try {{
-                        // Configure API key
-                        if (typeof pluginObj.setAPIKey === 'function') {{
-                            pluginObj.setAPIKey('{self.captcha_api_key}');
-                        }}
-                        
-                        // Enable automatic solving
-                        if (typeof pluginObj.setAutoSolveEnabled === 'function') {{
-                            pluginObj.setAutoSolveEnabled(true);
-                        }}
-                        
-                        // Set solve timeout
-                        if (typeof pluginObj.setTimeout === 'function') {{
-                            pluginObj.setTimeout(120);
-                        }}
-                        
-                        // Enable debug mode for development
-                        if (typeof pluginObj.setDebugEnabled === 'function') {{
-                            pluginObj.setDebugEnabled(true);
-                        }}
-                        
-                        console.log('Anti-Captcha plugin configured successfully');
-                        return 'plugin_configured_success';
-                    }} catch (e) {{
-                        console.error('Anti-Captcha plugin configuration error:', e);
-                        return 'plugin_configured_error';
-                    }}
-                }} else {{
-                    attempts++;
-                    if (attempts < maxAttempts) {{
-                        setTimeout(configurePlugin, 1000);
-                        return 'plugin_waiting';
-                    }} else {{
-                        console.error('Anti-Captcha plugin not detected after', maxAttempts, 'attempts');
-                        return 'plugin_not_found';
-                    }}
-                }}
-            }}
-            
-            return configurePlugin();
-            """
-            
-            # Execute configuration
-            result = self.driver.execute_script(config_script)
-            
-            # Wait for configuration to complete
-            max_wait = 15  # seconds
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait:
-                try:
-                    check_result = self.driver.execute_script("""
-                        var pluginObj = window.AntiCaptcha || 
-                                       window.antiCaptchaPlugin || 
-                                       window.anticaptcha ||
-                                       window.AC;
-                        return pluginObj ? 'plugin_ready' : 'plugin_not_ready';
-                    """)
-                    if check_result == 'plugin_ready':
-                        logger.info("✅ Anti-Captcha plugin configured and ready")
-                        return True
-                    await asyncio.sleep(1)
-                except:
-                    await asyncio.sleep(1)
+            self.driver.set_script_timeout(16)
+            result = await self._run_blocking(self.driver.execute_async_script, _PLUGIN_CONFIG_JS, self.captcha_api_key)
+            
+            if result == 'plugin_configured_success':
+                logger.info("✅ Anti-Captcha plugin configured and ready")
+                return True
+            if result == 'plugin_configured_error':
+                logger.warning("⚠️ Anti-Captcha plugin found but configuration failed")
+                return True
             
             logger.warning("⚠️ Anti-Captcha plugin configuration timeout")
             return False
@@ -508,19 +963,39 @@ chrome.webRequest.onAuthRequired.addListener(
             
             # Test basic navigation
             logger.debug("🧪 Testing browser connection...")
-            start_time = time.time()
             
-            # Try to navigate to a test page
-            test_url = "https://httpbin.org/ip"
-            self.driver.get(test_url)
+            # Без прокси проверять внешний сайт незачем: достаточно CDP-пинга
+            if self.fallback_mode:
+                version = await self._run_blocking(self.driver.execute_cdp_cmd, "Browser.getVersion", {})
+                logger.debug(f"✅ Browser connection test passed ({version.get('product', 'unknown')})")
+                return True
             
-            # Wait for page to load
-            await asyncio.sleep(2)
+            # Wait until the response is rendered instead of a fixed sleep
+            # Читаем только начало текста страницы через CDP, а не весь DOM через page_source
+            def has_response(driver) -> bool:
+                result = driver.execute_cdp_cmd("Runtime.evaluate", {
+                    "expression": "document.body ? document.body.innerText.slice(0, 256) : ''",
+                    "returnByValue": True,
+                })
+                text = (result.get("result", {}).get("value") or "").lower()
+                return "origin" in text or "ip" in text
+            
+            # Через прокси загружаем тестовую страницу - это и есть проверка прокси
+            test_url = "https://httpbin.org/ip"
+            with _stopwatch() as elapsed:
+                await self._run_blocking(self.driver.get, test_url)
+                
+                try:
+                    await self._run_blocking(
+                        WebDriverWait(self.driver, 10, poll_frequency=0.2).until, has_response
+                    )
+                    got_response = True
+                except TimeoutException:
+                    got_response = False
             
             # Check if we got a response
-            page_source = self.driver.page_source.lower()
-            if "origin" in page_source or "ip" in page_source:
-                response_time = time.time() - start_time
+            if got_response:
+                response_time = elapsed()
                 logger.debug(f"✅ Browser connection test passed ({response_time:.2f}s)")
                 
                 # Mark proxy as successful if we used one
@@ -544,17 +1019,20 @@ chrome.webRequest.onAuthRequired.addListener(
                 return False
             
             logger.info(f"🌐 Navigating to: {url}")
-            start_time = time.time()
+            parts = urlsplit(url)
+            self.visited_origins.add(f"{parts.scheme}://{parts.netloc}")
             
-            self.driver.get(url)
-            
-            # Wait for page load
-            await asyncio.sleep(3)
+            with _stopwatch() as elapsed:
+                await self._run_blocking(self.driver.get, url)
+                
+                # Wait for page load
+                await asyncio.sleep(3)
+                
+                # Check if navigation was successful
+                current_url = await self._run_blocking(lambda: self.driver.current_url)
             
-            # Check if navigation was successful
-            current_url = self.driver.current_url
             if current_url and not current_url.startswith("data:"):
-                response_time = time.time() - start_time
+                response_time = elapsed()
                 logger.info(f"✅ Navigation successful ({response_time:.2f}s)")
                 
                 # Mark proxy as successful if we used one
@@ -582,7 +1060,7 @@ chrome.webRequest.onAuthRequired.addListener(
                 return False
             
             wait = WebDriverWait(self.driver, timeout)
-            element = wait.until(EC.presence_of_element_located((by, value)))
+            element = await self._run_blocking(wait.until, EC.presence_of_element_located((by, value)))
             return element is not None
             
         except TimeoutException:
@@ -591,14 +1069,33 @@ chrome.webRequest.onAuthRequired.addListener(
         except Exception as e:
             logger.error(f"❌ Error waiting for element: {e}")
             return False
-    
+
+    async def wait_for_page_ready(self, timeout: int = 10) -> bool:
+        """Wait until document.readyState is 'complete' instead of a fixed sleep"""
+        try:
+            if not self.driver:
+                return False
+
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=0.2)
+            await self._run_blocking(
+                wait.until, lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            return True
+
+        except TimeoutException:
+            logger.debug(f"⏰ Page not ready within {timeout}s")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Error waiting for page ready: {e}")
+            return False
+
     async def find_element_safe(self, by: By, value: str) -> Optional[Any]:
         """Find element safely without throwing exceptions"""
         try:
             if not self.driver:
                 return None
             
-            return self.driver.find_element(by, value)
+            return await self._run_blocking(self.driver.find_element, by, value)
             
         except Exception as e:
             logger.debug(f"🔍 Element not found: {value} ({e})")
@@ -610,7 +1107,7 @@ chrome.webRequest.onAuthRequired.addListener(
             if not self.driver:
                 return []
             
-            return self.driver.find_elements(by, value)
+            return await self._run_blocking(self.driver.find_elements, by, value)
             
         except Exception as e:
             logger.debug(f"🔍 Elements not found: {value} ({e})")
@@ -623,11 +1120,11 @@ chrome.webRequest.onAuthRequired.addListener(
                 return False
             
             # Scroll to element first
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+            await self._run_blocking(self.driver.execute_script, "arguments[0].scrollIntoView(true);", element)
             await asyncio.sleep(0.5)
             
             # Try to click
-            element.click()
+            await self._run_blocking(element.click)
             await asyncio.sleep(0.5)
             
             return True
@@ -643,11 +1140,11 @@ chrome.webRequest.onAuthRequired.addListener(
                 return False
             
             # Clear field first
-            element.clear()
+            await self._run_blocking(element.clear)
             await asyncio.sleep(0.2)
             
             # Type text
-            element.send_keys(text)
+            await self._run_blocking(element.send_keys, text)
             await asyncio.sleep(0.2)
             
             return True
@@ -662,7 +1159,7 @@ chrome.webRequest.onAuthRequired.addListener(
             if not self.driver:
                 return ""
             
-            return self.driver.page_source
+            return await self._run_blocking(lambda: self.driver.page_source)
             
         except Exception as e:
             logger.error(f"❌ Failed to get page source: {e}")
@@ -679,13 +1176,27 @@ chrome.webRequest.onAuthRequired.addListener(
                 filename = f"logs/automation/screenshot_{timestamp}.png"
             
             # Ensure directory exists
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            
-            success = self.driver.save_screenshot(filename)
-            if success:
-                logger.info(f"📸 Screenshot saved: {filename}")
+            directory = os.path.dirname(filename)
+            if directory:
+                await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+            
+            # .jpg/.jpeg: JPEG прямо из Chrome через CDP - в разы меньше, чем PNG
+            if filename.lower().endswith(('.jpg', '.jpeg')):
+                def capture() -> bytes:
+                    result = self.driver.execute_cdp_cmd(
+                        "Page.captureScreenshot", {"format": "jpeg", "quality": 60}
+                    )
+                    return base64.b64decode(result["data"])
+            else:
+                capture = self.driver.get_screenshot_as_png
             
-            return success
+            # Capture and decode on the WebDriver thread, write without blocking the loop
+            image_bytes = await self._run_blocking(capture)
+            async with aiofiles.open(filename, 'wb') as f:
+                await f.write(image_bytes)
+            logger.info(f"📸 Screenshot saved: {filename}")
+
+            return True
             
         except Exception as e:
             logger.error(f"❌ Screenshot failed: {e}")
@@ -695,6 +1206,7 @@ chrome.webRequest.onAuthRequired.addListener(
         """Restart browser (useful for proxy rotation)"""
         try:
             logger.info("🔄 Restarting browser...")
+            self._alive_cache = None
             
             # Close current browser
             await self._cleanup_browser()
@@ -721,11 +1233,22 @@ chrome.webRequest.onAuthRequired.addListener(
                 return False
             
             logger.info("🔄 Switching proxy...")
+            self._alive_cache = None
             
             # Mark current proxy as failed if we have one
             if self.current_proxy:
                 await self.proxy_manager.mark_proxy_failed(self.current_proxy.host, self.current_proxy.port, "proxy_switch")
             
+            # Warm browser with another proxy from the pool: swap drivers, no Chrome restart
+            if self._pool_enabled() and self.driver:
+                old_driver, old_profile, old_extension = self.driver, self.profile_dir, self.auth_extension_path
+                if await self._acquire_pooled_driver(use_proxy=True, exclude=self.current_proxy):
+                    # Old proxy is marked failed - its browser is not returned to the pool
+                    self._spawn_background(self._recycle_driver(old_driver, old_profile, old_extension))
+                    self._schedule_pool_refill()
+                    logger.info("✅ Proxy switched to a pooled browser")
+                    return True
+            
             # Restart browser with new proxy
             success = await self.restart_browser()
             
@@ -743,72 +1266,104 @@ chrome.webRequest.onAuthRequired.addListener(
     async def _cleanup_browser(self):
         """Clean up browser resources"""
         try:
+            self._alive_cache = None
             if self.driver:
-                self.driver.quit()
-                self.driver = None
+                driver, self.driver = self.driver, None
                 self.plugin_loaded = False
+                # Chrome shutdown can take seconds - keep the event loop free
+                await asyncio.wait_for(asyncio.to_thread(driver.quit), timeout=5)
                 logger.debug("🧹 Browser cleaned up")
-            
-            # Очищаем временное расширение прокси-аутентификации
-            auth_extension_path = os.path.join(os.getcwd(), 'proxy_auth_extension')
-            if os.path.exists(auth_extension_path):
-                import shutil
-                shutil.rmtree(auth_extension_path, ignore_errors=True)
-                logger.debug("🧹 Proxy auth extension cleaned up")
                 
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Browser did not quit within 5s, abandoning it")
         except Exception as e:
             logger.debug(f"🧹 Browser cleanup error: {e}")
     
+    async def _remove_proxy_auth_extension(self):
+        """Удаляет расширение прокси-аутентификации (вместе с учетными данными)"""
+        if self.auth_extension_path:
+            await asyncio.to_thread(shutil.rmtree, self.auth_extension_path, True)
+            self.auth_extension_path = None
+            logger.debug("🧹 Proxy auth extension cleaned up")
+    
     async def _cleanup_xvfb(self):
         """Clean up Xvfb resources"""
+        process, self.xvfb_process = self.xvfb_process, None
+        display, self.xvfb_display = self.xvfb_display, None
+        if process is None or process.returncode is not None:
+            # Не запускался или уже завершился сам: его lock-файл мог занять другой Xvfb
+            return
+        
         try:
-            if hasattr(self, 'xvfb_process') and self.xvfb_process:
-                self.xvfb_process.terminate()
-                self.xvfb_process.wait()
-                logger.debug("🧹 Xvfb cleaned up")
+            # Xvfb may ignore SIGTERM: bounded wait, then SIGKILL the whole group
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+                await asyncio.wait_for(process.wait(), timeout=3)
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Xvfb did not exit on SIGTERM, killing")
+                os.killpg(process.pid, signal.SIGKILL)
+                await process.wait()
+            except ProcessLookupError:
+                pass
+            logger.debug("🧹 Xvfb cleaned up")
         except Exception as e:
             logger.debug(f"🧹 Xvfb cleanup error: {e}")
+        
+        # A killed Xvfb leaves its lock behind and the display looks busy
+        if display:
+            try:
+                os.remove(f"/tmp/.X{display.lstrip(':')}-lock")
+            except OSError:
+                pass
     
     async def close(self):
         """Close browser and clean up resources"""
         logger.info("🛑 Closing browser...")
-        await self._cleanup_browser()
+        if not await self._release_to_pool():
+            await self._cleanup_browser()
+            await self._remove_proxy_auth_extension()
+            await self._remove_profile_dir()
         await self._cleanup_xvfb()
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
         self.current_proxy = None
         self.fallback_mode = False
     
     def is_alive(self) -> bool:
-        """Check if browser is still alive"""
+        """Check if browser is still alive (probe result cached for 0.5s)"""
+        if not self.driver:
+            return False
+        
+        now = time.monotonic()
+        if self._alive_cache is not None and now - self._alive_cache[0] < 0.5:
+            return self._alive_cache[1]
+        
         try:
-            if not self.driver:
-                return False
-            
             # Try to get current URL
-            current_url = self.driver.current_url
-            return current_url is not None
-            
+            alive = self.driver.current_url is not None
         except Exception:
-            return False
+            alive = False
+        self._alive_cache = (now, alive)
+        return alive
     
     def get_status(self) -> Dict[str, Any]:
         """Get browser status information"""
-        return {
-            "is_alive": self.is_alive(),
-            "fallback_mode": self.fallback_mode,
-            "plugin_loaded": self.plugin_loaded,
-            "xvfb_mode": self.use_xvfb,
-            "xvfb_display": self.xvfb_display,
-            "current_proxy": {
-                "id": self.current_proxy.id if self.current_proxy else None,
-                "host": self.current_proxy.host if self.current_proxy else None,
-                "port": self.current_proxy.port if self.current_proxy else None
+        status = self._status_static.copy()
+        status.update(
+            is_alive=self.is_alive(),
+            fallback_mode=self.fallback_mode,
+            plugin_loaded=self.plugin_loaded,
+            xvfb_display=self.xvfb_display,
+            current_proxy={
+                "id": self.current_proxy.id,
+                "host": self.current_proxy.host,
+                "port": self.current_proxy.port
             } if self.current_proxy else None,
-            "headless": self.headless,
-            "window_size": self.window_size,
-            "captcha_plugin_enabled": self.captcha_plugin_enabled,
-            "captcha_plugin_available": self._check_plugin_availability(),
-            "environment": self.environment
-        }
+            captcha_plugin_enabled=self.captcha_plugin_enabled,
+            captcha_plugin_available=self._check_plugin_availability(),
+        )
+        return status
     
     # Keep all existing utility methods
     async def enable_javascript(self):
@@ -832,17 +1387,29 @@ chrome.webRequest.onAuthRequired.addListener(
             if not self.driver:
                 return False
             
-            alert = self.driver.switch_to.alert
-            if accept:
-                alert.accept()
-            else:
-                alert.dismiss()
+            # Polling loops: "no alert" seen <200ms ago - skip the chromedriver round-trip
+            if time.monotonic() - self._no_alert_at < 0.2:
+                return False
+            
+            def resolve_alert():
+                alert = self.driver.switch_to.alert
+                if accept:
+                    alert.accept()
+                else:
+                    alert.dismiss()
+            
+            await self._run_blocking(resolve_alert)
             
             logger.debug("🚨 Alert handled")
             return True
             
+        except NoAlertPresentException:
+            self._no_alert_at = time.monotonic()
+            if accept:
+                logger.debug("🚨 No alert to handle")
+            return False
         except Exception as e:
-            logger.debug(f"🚨 No alert to handle: {e}")
+            logger.debug(f"🚨 Alert handling failed: {e}")
             return False
     
     async def execute_script(self, script: str, *args) -> Any:
@@ -851,7 +1418,7 @@ chrome.webRequest.onAuthRequired.addListener(
             if not self.driver:
                 return None
             
-            return self.driver.execute_script(script, *args)
+            return await self._run_blocking(self.driver.execute_script, script, *args)
             
         except Exception as e:
             logger.debug(f"❌ Script execution failed: {e}")
@@ -879,4 +1446,26 @@ chrome.webRequest.onAuthRequired.addListener(
             
         except Exception as e:
             logger.debug(f"❌ Failed to get element attribute: {e}")
-            return ""
\ No newline at end of file
+            return ""
+    
+    async def get_elements_text_bulk(self, elements) -> List[str]:
+        """Get text of many elements in one WebDriver round-trip"""
+        elements = list(elements)
+        if not elements:
+            return []
+        
+        texts = await self.execute_script(_BULK_TEXT_JS, elements)
+        if texts is None:
+            return [""] * len(elements)
+        return texts
+    
+    async def get_elements_attributes_bulk(self, elements, attrs: List[str]) -> List[Dict[str, str]]:
+        """Get several attributes of many elements in one WebDriver round-trip"""
+        elements = list(elements)
+        if not elements:
+            return []
+        
+        values = await self.execute_script(_BULK_ATTRIBUTES_JS, elements, list(attrs))
+        if values is None:
+            return [dict.fromkeys(attrs, "") for _ in elements]
+        return values
\ No newline at end of file